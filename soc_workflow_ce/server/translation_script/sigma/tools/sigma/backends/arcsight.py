@@ -35,94 +35,69 @@ class ArcSightBackend(SingleTextQueryBackend):
     mapExpression = "%s = %s"
     mapListsSpecialHandling = True
     mapListValueExpression = "%s = %s"
+    reCleanNode = re.compile(r"[ \/\\@?#&_%*',\(\)\"]")     # special characters that split values into separate search terms
+    mapItemGenerators = {
+            str: "generateStringMapItemNode",
+            int: "generateIntMapItemNode",
+            list: "generateListMapItemNode",
+            }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        aFL = ["deviceVendor", "categoryDeviceGroup", "deviceProduct"]
+        aFL = {"deviceVendor", "categoryDeviceGroup", "deviceProduct"}
         for item in self.sigmaconfig.fieldmappings.values():
             if item.target_type is list:
-                aFL.extend(item.target)
+                aFL.update(item.target)
             else:
-                aFL.append(item.target)
-        self.allowedFieldsList = list(set(aFL))
+                aFL.add(item.target)
+        self.allowedFieldsList = frozenset(aFL)
 
     # Skip logsource value from sigma document for separate path.
     def generateCleanValueNodeLogsource(self, value):
-        return self.valueExpression % (self.cleanValue(str(value)))
+        return self.formatValue(self.cleanValue(str(value)))
 
     # Clearing values from special characters.
     def CleanNode(self, node):
-        search_ptrn = re.compile(r"[\/\\@?#&_%*',\(\)\" ]")
-        replace_ptrn = re.compile(r"[ \/\\@?#&_%*',\(\)\" ]")
-        match = search_ptrn.search(str(node))
-        new_node = list()
-        if match:
-            replaced_str = replace_ptrn.sub('*', node)
-            node = [x for x in replaced_str.split('*') if x]
-            new_node.extend(node)
-        else:
-            new_node.append(node)
-        node = new_node
-        return node
+        replaced_str, count = self.reCleanNode.subn('*', str(node))
+        if count == 0:
+            return [node]
+        return [x for x in replaced_str.split('*') if x]
 
     # Clearing values from special characters.
-    def generateMapItemNode(self, node):
-        key, value = node
+    def generateStringMapItemNode(self, key, value):
         if key in self.allowedFieldsList:
-            if self.mapListsSpecialHandling == False and type(value) in (
-                    str, int, list) or self.mapListsSpecialHandling == True and type(value) in (str, int):
-                return self.mapExpression % (key, self.generateCleanValueNodeLogsource(value))
-            elif type(value) is list:
-                return self.generateMapItemListNode(key, value)
-            else:
-                raise TypeError("Backend does not support map values of type " + str(type(value)))
-        else:
-            if self.mapListsSpecialHandling == False and type(value) in (
-                    str, int, list) or self.mapListsSpecialHandling == True and type(value) in (str, int):
-                if type(value) is str:
-                    new_value = list()
-                    value = self.CleanNode(value)
-                    if type(value) == list:
-                        new_value.append(self.andToken.join([self.valueExpression % val for val in value]))
-                    else:
-                        new_value.append(value)
-                    if len(new_value)==1:
-                        return "(" + self.generateANDNode(new_value) + ")"
-                    else:
-                        return "(" + self.generateORNode(new_value) + ")"
-                else:
-                    return self.generateValueNode(value)
-            elif type(value) is list:
-                new_value = list()
-                for item in value:
-                    item = self.CleanNode(item)
-                    if type(item) is list and len(item) == 1:
-                        new_value.append(self.valueExpression % item[0])
-                    elif type(item) is list:
-                        new_value.append(self.andToken.join([self.valueExpression % val for val in item]))
-                    else:
-                        new_value.append(item)
-                return self.generateORNode(new_value)
-            else:
-                raise TypeError("Backend does not support map values of type " + str(type(value)))
+            return self.formatMapItem(key, self.generateCleanValueNodeLogsource(value))
+        formatValue = self.formatValue
+        return "(" + self.generateValueNode(self.andToken.join([ formatValue(val) for val in self.CleanNode(value) ])) + ")"
+
+    def generateIntMapItemNode(self, key, value):
+        if key in self.allowedFieldsList:
+            return self.formatMapItem(key, self.generateCleanValueNodeLogsource(value))
+        return self.generateValueNode(value)
+
+    def generateListMapItemNode(self, key, value):
+        if key in self.allowedFieldsList:
+            return self.generateMapItemListNode(key, value)
+        new_value = list()
+        for item in value:
+            new_value.append(self.andToken.join([self.formatValue(val) for val in self.CleanNode(item)]))
+        return self.generateORNode(new_value)
 
     # for keywords values with space
     def generateValueNode(self, node):
-        if type(node) is int:
-            return self.cleanValue(str(node))
-        if 'AND' in node:
-            return "(" + self.cleanValue(str(node)) + ")"
-        else:
-            return self.cleanValue(str(node))
+        cleaned = self.cleanValue(str(node))
+        if type(node) is not int and 'AND' in node:
+            return "(" + cleaned + ")"
+        return cleaned
 
     # collect elements of Arcsight search using OR
     def generateMapItemListNode(self, key, value):
-        itemslist = list()
-        for item in value:
-            if key in self.allowedFieldsList:
-                itemslist.append('%s = %s' % (key, self.generateValueNode(item)))
-            else:
-                itemslist.append('%s' % (self.generateValueNode(item)))
+        generateValueNode = self.generateValueNode
+        if key in self.allowedFieldsList:
+            prefix = key + " = "
+            itemslist = [ prefix + generateValueNode(item) for item in value ]
+        else:
+            itemslist = [ generateValueNode(item) for item in value ]
         return " OR ".join(itemslist)
 
     # prepare of tail for every translate
@@ -134,17 +109,13 @@ class ArcSightBackend(SingleTextQueryBackend):
 
     # Add "( )" for values
     def generateSubexpressionNode(self, node):
-        return self.subExpression % self.generateNode(node.items)
+        return self.formatSubexpression(self.generateNode(node.items))
 
     # generateORNode algorithm for ArcSightBackend class.
     def generateORNode(self, node):
+        generateNode = self.generateNode
         if type(node) == ConditionOR and all(isinstance(item, str) for item in node):
-            new_value = list()
-            for value in node:
-                value = self.CleanNode(value)
-                if type(value) is list:
-                    new_value.append(self.andToken.join([self.valueExpression % val for val in value]))
-                else:
-                    new_value.append(value)
-            return "(" + self.orToken.join([self.generateNode(val) for val in new_value]) + ")"
-        return "(" + self.orToken.join([self.generateNode(val) for val in node]) + ")"
+            andToken = self.andToken
+            formatValue = self.formatValue
+            return "(" + self.orToken.join([ generateNode(andToken.join([ formatValue(val) for val in self.CleanNode(value) ])) for value in node ]) + ")"
+        return "(" + self.orToken.join([ generateNode(val) for val in node ]) + ")"
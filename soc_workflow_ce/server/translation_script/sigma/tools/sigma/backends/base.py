@@ -15,8 +15,30 @@
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import sigma
+import sigma.configuration
+from sigma.parser.condition import ConditionAND, ConditionOR, ConditionNOT, ConditionNULLValue, ConditionNotNULLValue, NodeSubexpression
 from .mixins import RulenameCommentMixin, QuoteCharMixin
 
+def compileFormatter(expression):
+    """
+    Compile a %-style expression into a function that takes one argument per %s placeholder and renders it as f-string,
+    which avoids parsing the format string on each call. Expressions with other conversions are rendered with the %
+    operator. Returns None if no expression is defined.
+    """
+    if expression is None:
+        return None
+    parts = expression.split("%s")
+    if any("%" in part for part in parts):
+        return lambda *args: expression % args
+    args = [ "arg%d" % i for i in range(len(parts) - 1) ]
+    template = parts[0].replace("{", "{{").replace("}", "}}")
+    for arg, part in zip(args, parts[1:]):
+        template += "{" + arg + "}" + part.replace("{", "{{").replace("}", "}}")
+    # eval is deliberate, an f-string can't be built at runtime otherwise. Expressions only come from backend class
+    # attributes, never from rules or options. The file name makes tracebacks show the expression instead of <string>.
+    source = "lambda %s: f%r" % (", ".join(args), template)
+    return eval(compile(source, "<formatter %r>" % expression, "eval"))
+
 class BackendOptions(dict):
     """Object contains all options that should be passed to the backend from command line (or other user interfaces)"""
 
@@ -36,6 +58,8 @@ class BackendOptions(dict):
             except IndexError:
                 self[parsed[0]] = True
 
+backendRegistry = dict()    # identifier -> active backend class, filled when the backend classes are defined
+
 ### Generic backend base classes
 class BaseBackend:
     """Base class for all backends"""
@@ -44,6 +68,23 @@ class BaseBackend:
     index_field = None    # field name that is used to address indices
     file_list = None
     options = tuple()     # a list of tuples with following elements: option name, default value, help text, target attribute name (option name if None)
+    nodeGenerators = {    # parse tree node type -> name of generator method, bound to each instance in __init__ so subclasses can override them
+            ConditionAND: "generateANDNode",
+            ConditionOR: "generateORNode",
+            ConditionNOT: "generateNOTNode",
+            ConditionNULLValue: "generateNULLValueNode",
+            ConditionNotNULLValue: "generateNotNULLValueNode",
+            NodeSubexpression: "generateSubexpressionNode",
+            tuple: "generateMapItemNode",
+            str: "generateValueNode",
+            int: "generateValueNode",
+            list: "generateListNode",
+            }
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.active:
+            backendRegistry[cls.identifier] = cls
 
     def __init__(self, sigmaconfig, backend_options=None):
         """
@@ -51,11 +92,12 @@ class BaseBackend:
         passing the object instance to it.
         """
         super().__init__()
-        if not isinstance(sigmaconfig, (sigma.configuration.SigmaConfiguration, None)):
+        if __debug__ and sigmaconfig is not None and not isinstance(sigmaconfig, sigma.configuration.SigmaConfiguration):
             raise TypeError("SigmaConfiguration object expected")
         self.backend_options = backend_options
         self.sigmaconfig = sigmaconfig
         self.sigmaconfig.set_backend(self)
+        self.nodeDispatch = { nodetype: getattr(self, generator) for nodetype, generator in self.nodeGenerators.items() }     # parse tree node type -> bound generator method
 
         # Parse options
         for option, default_value, _, target in self.options:
@@ -87,26 +129,12 @@ class BaseBackend:
         return result
 
     def generateNode(self, node):
-        if type(node) == sigma.parser.condition.ConditionAND:
-            return self.generateANDNode(node)
-        elif type(node) == sigma.parser.condition.ConditionOR:
-            return self.generateORNode(node)
-        elif type(node) == sigma.parser.condition.ConditionNOT:
-            return self.generateNOTNode(node)
-        elif type(node) == sigma.parser.condition.ConditionNULLValue:
-            return self.generateNULLValueNode(node)
-        elif type(node) == sigma.parser.condition.ConditionNotNULLValue:
-            return self.generateNotNULLValueNode(node)
-        elif type(node) == sigma.parser.condition.NodeSubexpression:
-            return self.generateSubexpressionNode(node)
-        elif type(node) == tuple:
-            return self.generateMapItemNode(node)
-        elif type(node) in (str, int):
-            return self.generateValueNode(node)
-        elif type(node) == list:
-            return self.generateListNode(node)
-        else:
-            raise TypeError("Node type %s was not expected in Sigma parse tree" % (str(type(node))))
+        """Dispatch node to the generator method for its type"""
+        try:
+            generator = self.nodeDispatch[type(node)]
+        except KeyError:
+            raise TypeError("Node type %s was not expected in Sigma parse tree" % (str(type(node)))) from None
+        return generator(node)
 
     def generateANDNode(self, node):
         raise NotImplementedError("Node type not implemented for this backend")
@@ -169,18 +197,97 @@ class SingleTextQueryBackend(RulenameCommentMixin, BaseBackend, QuoteCharMixin):
     mapExpression = None                # Syntax for field/value conditions. First %s is fieldname, second is value
     mapListsSpecialHandling = False     # Same handling for map items with list values as for normal values (strings, integers) if True, generateMapItemListNode method is called with node
     mapListValueExpression = None       # Syntax for field/value condititons where map value is a list
+    mapListsAsValues = True             # List values of map items are generated like strings and integers, derived from mapListsSpecialHandling for each subclass
+    walkIteratively = True              # Boolean operators and subexpressions are generated without recursion, set for each subclass that doesn't override or remap their generation
+    mapItemGenerators = None            # map value type -> name of generator method called with field name and value, replaces the generic map item generation if set
+
+    # formatters compiled from the expressions above for each subclass, called with one argument per %s placeholder
+    formatters = (
+            ("subExpression", "formatSubexpression"),
+            ("listExpression", "formatList"),
+            ("valueExpression", "formatValue"),
+            ("nullExpression", "formatNULLValue"),
+            ("notNullExpression", "formatNotNULLValue"),
+            ("mapExpression", "formatMapItem"),
+            ("mapListValueExpression", "formatMapItemList"),
+            )
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        for expression, formatter in cls.formatters:
+            setattr(cls, formatter, staticmethod(compileFormatter(getattr(cls, expression))))
+        cls.mapListsAsValues = not cls.mapListsSpecialHandling
+        cls.walkIteratively = all(
+                getattr(cls, method) is getattr(SingleTextQueryBackend, method)
+                for method in ("generateNode", "generateANDNode", "generateORNode", "generateNOTNode", "generateSubexpressionNode")
+                ) and all(
+                cls.nodeGenerators.get(nodetype) == BaseBackend.nodeGenerators[nodetype]
+                for nodetype in (ConditionAND, ConditionOR, ConditionNOT, NodeSubexpression)
+                )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        if self.mapItemGenerators is None:
+            self.mapItemDispatch = None
+        else:       # map value type -> bound generator method
+            self.mapItemDispatch = { valuetype: getattr(self, generator) for valuetype, generator in self.mapItemGenerators.items() }
+
+    def generateNode(self, node):
+        """
+        Generate AND, OR, NOT and subexpression nodes in post-order with an explicit stack instead of one Python frame
+        per nesting level. The output is identical to the recursive generate*Node methods, all other nodes are passed to
+        the generic dispatcher.
+        """
+        nodetype = type(node)
+        if not self.walkIteratively or nodetype not in (ConditionAND, ConditionOR, ConditionNOT, NodeSubexpression):
+            return super().generateNode(node)
+
+        generateLeaf = super().generateNode
+        formatSubexpression = self.formatSubexpression
+        notToken = self.notToken
+        joinTokens = { ConditionAND: self.andToken, ConditionOR: self.orToken }    # tokens bound once per walk instead of per node
+        results = list()
+        stack = [ (node, False) ]
+        while stack:
+            node, visited = stack.pop()
+            nodetype = type(node)
+            if visited:     # all children were generated and are on top of the results stack
+                if nodetype is NodeSubexpression:
+                    generated = results.pop()
+                    result = formatSubexpression(generated) if generated else None
+                elif nodetype is ConditionNOT:
+                    generated = results.pop()
+                    result = notToken + generated if generated is not None else None
+                else:
+                    count = len(node.items)
+                    filtered = [ g for g in results[len(results) - count:] if g is not None ]
+                    del results[len(results) - count:]
+                    if filtered:
+                        result = joinTokens[nodetype].join(filtered)
+                    else:
+                        result = None
+                results.append(result)
+            elif nodetype in (ConditionAND, ConditionOR, ConditionNOT, NodeSubexpression):
+                stack.append((node, True))
+                if nodetype is NodeSubexpression:
+                    stack.append((node.items, False))
+                elif nodetype is ConditionNOT:
+                    stack.append((node.item, False))
+                else:
+                    stack.extend((child, False) for child in reversed(node.items))
+            else:
+                results.append(generateLeaf(node))
+        return results[0]
 
     def generateANDNode(self, node):
-        generated = [ self.generateNode(val) for val in node ]
-        filtered = [ g for g in generated if g is not None ]
+        filtered = [ g for g in map(self.generateNode, node) if g is not None ]
         if filtered:
             return self.andToken.join(filtered)
         else:
             return None
 
     def generateORNode(self, node):
-        generated = [ self.generateNode(val) for val in node ]
-        filtered = [ g for g in generated if g is not None ]
+        filtered = [ g for g in map(self.generateNode, node) if g is not None ]
         if filtered:
             return self.orToken.join(filtered)
         else:
@@ -196,37 +303,44 @@ class SingleTextQueryBackend(RulenameCommentMixin, BaseBackend, QuoteCharMixin):
     def generateSubexpressionNode(self, node):
         generated = self.generateNode(node.items)
         if generated:
-            return self.subExpression % generated
+            return self.formatSubexpression(generated)
         else:
             return None
 
     def generateListNode(self, node):
-        if not set([type(value) for value in node]).issubset({str, int}):
+        if not all(type(value) in (str, int) for value in node):
             raise TypeError("List values must be strings or numbers")
-        return self.listExpression % (self.listSeparator.join([self.generateNode(value) for value in node]))
+        return self.formatList(self.listSeparator.join(map(self.generateNode, node)))
 
     def generateMapItemNode(self, node):
         fieldname, value = node
+        if self.mapItemDispatch is not None:
+            try:
+                generator = self.mapItemDispatch[type(value)]
+            except KeyError:
+                raise TypeError("Backend does not support map values of type " + str(type(value))) from None
+            return generator(fieldname, value)
 
         transformed_fieldname = self.fieldNameMapping(fieldname, value)
-        if self.mapListsSpecialHandling == False and type(value) in (str, int, list) or self.mapListsSpecialHandling == True and type(value) in (str, int):
-            return self.mapExpression % (transformed_fieldname, self.generateNode(value))
-        elif type(value) == list:
+        valueType = type(value)
+        if valueType is str or valueType is int or valueType is list and self.mapListsAsValues:
+            return self.formatMapItem(transformed_fieldname, self.generateNode(value))
+        elif valueType is list:
             return self.generateMapItemListNode(transformed_fieldname, value)
         else:
-            raise TypeError("Backend does not support map values of type " + str(type(value)))
+            raise TypeError("Backend does not support map values of type " + str(valueType))
 
     def generateMapItemListNode(self, fieldname, value):
-        return self.mapListValueExpression % (fieldname, self.generateNode(value))
+        return self.formatMapItemList(fieldname, self.generateNode(value))
 
     def generateValueNode(self, node):
-        return self.valueExpression % (self.cleanValue(str(node)))
+        return self.formatValue(self.cleanValue(str(node)))
 
     def generateNULLValueNode(self, node):
-        return self.nullExpression % (node.item)
+        return self.formatNULLValue(node.item)
 
     def generateNotNULLValueNode(self, node):
-        return self.notNullExpression % (node.item)
+        return self.formatNotNULLValue(node.item)
 
     def fieldNameMapping(self, fieldname, value):
         """
@@ -18,7 +18,7 @@ import sys
 import json
 import re
 import sigma.backends
-from .base import BaseBackend
+from .base import backendRegistry
 import pkgutil
 import importlib
 import os
@@ -28,22 +28,30 @@ def getAllSubclasses(cls):
         yield from getAllSubclasses(subcls)
         yield cls
 
-def getBackendList():
-    """Return list of backend classes"""
+backendsImported = False
+
+def importBackends():
+    """Import all backend modules once, the contained backend classes register themselves in backendRegistry"""
+    global backendsImported
+    if backendsImported:
+        return
     path = os.path.dirname(__file__)
-    backend_classes = list()
     for finder, name, ispkg in pkgutil.iter_modules([ path ]):
-        module = importlib.import_module("." + name, __package__)
-        for name, cls in vars(module).items():
-            if type(cls) == type and issubclass(cls, BaseBackend) and cls.active:
-                backend_classes.append(cls)
-    return backend_classes
+        importlib.import_module("." + name, __package__)
+    backendsImported = True
+
+def getBackendList():
+    """Return list of backend classes"""
+    importBackends()
+    return list(backendRegistry.values())
 
 def getBackendDict():
-    return {cls.identifier: cls for cls in getBackendList() }
+    importBackends()
+    return dict(backendRegistry)
 
 def getBackend(name):
+    importBackends()
     try:
-        return getBackendDict()[name]
+        return backendRegistry[name]
     except KeyError as e:
         raise LookupError("Backend not found") from e
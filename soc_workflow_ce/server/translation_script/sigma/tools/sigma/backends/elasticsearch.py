@@ -133,22 +133,13 @@ class ElasticsearchDSLBackend(RulenameCommentMixin, ElasticsearchWildcardHandlin
         # self.fields.update(fields)
 
     def generateANDNode(self, node):
-        andNode = {'bool': {'must': []}}
-        for val in node:
-            andNode['bool']['must'].append(self.generateNode(val))
-        return andNode
+        return {'bool': {'must': list(map(self.generateNode, node))}}
 
     def generateORNode(self, node):
-        orNode = {'bool': {'should': []}}
-        for val in node:
-            orNode['bool']['should'].append(self.generateNode(val))
-        return orNode
+        return {'bool': {'should': list(map(self.generateNode, node))}}
 
     def generateNOTNode(self, node):
-        notNode = {'bool': {'must_not': []}}
-        for val in node:
-            notNode['bool']['must_not'].append(self.generateNode(val))
-        return notNode
+        return {'bool': {'must_not': list(map(self.generateNode, node))}}
 
     def generateSubexpressionNode(self, node):
         return self.generateNode(node.items)
@@ -259,6 +250,24 @@ class KibanaBackend(ElasticsearchQuerystringBackend, MultiRuleOutputMixin):
             ("index", ".kibana", "Kibana index", None),
             ("prefix", "Sigma: ", "Title prefix of Sigma queries", None),
             )
+    # searchSourceJSON of saved searches, serialized once and split into the parts around the index and query values
+    searchSourceTemplate = json.dumps({
+            "index": None,
+            "filter":  [],
+            "highlight": {
+                "pre_tags": ["@kibana-highlighted-field@"],
+                "post_tags": ["@/kibana-highlighted-field@"],
+                "fields": { "*":{} },
+                "require_field_match": False,
+                "fragment_size": 2147483647
+                },
+            "query": {
+                "query_string": {
+                    "query": None,
+                    "analyze_wildcard": True
+                    }
+                }
+            }).split("null")
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -267,11 +276,13 @@ class KibanaBackend(ElasticsearchQuerystringBackend, MultiRuleOutputMixin):
 
     def generate(self, sigmaparser):
         rulename = self.getRuleName(sigmaparser)
-        description = sigmaparser.parsedyaml.setdefault("description", "")
+        parsedyaml = sigmaparser.parsedyaml
+        title = self.prefix + parsedyaml["title"]
+        description = parsedyaml.get("description", "")
 
         columns = list()
         try:
-            for field in sigmaparser.parsedyaml["fields"]:
+            for field in parsedyaml["fields"]:
                 mapped = sigmaparser.config.get_fieldmapping(field).resolve_fieldname(field)
                 if type(mapped) == str:
                     columns.append(mapped)
@@ -293,8 +304,6 @@ class KibanaBackend(ElasticsearchQuerystringBackend, MultiRuleOutputMixin):
                 final_rulename = rulename
                 if len(indices) > 1:     # add index names if rule must be replicated because of ambigiuous index patterns
                     raise NotSupportedError("Multiple target indices are not supported by Kibana")
-                else:
-                    title = self.prefix + sigmaparser.parsedyaml["title"]
 
                 self.indexsearch.add(
                         "export {indexvar}=$(curl -s '{es}/{index}/_search?q=index-pattern.title:{indexpattern}' | jq -r '.hits.hits[0]._id | ltrimstr(\"index-pattern:\")')".format(
@@ -304,7 +313,7 @@ class KibanaBackend(ElasticsearchQuerystringBackend, MultiRuleOutputMixin):
                             indexvar=self.index_variable_name(index)
                             )
                         )
-                self.kibanaconf.append({
+                search = {
                         "_id": final_rulename,
                         "_type": "search",
                         "_source": {
@@ -317,36 +326,27 @@ class KibanaBackend(ElasticsearchQuerystringBackend, MultiRuleOutputMixin):
                             "kibanaSavedObjectMeta": {
                                 "searchSourceJSON": {
                                     "index": index,
-                                    "filter":  [],
-                                    "highlight": {
-                                        "pre_tags": ["@kibana-highlighted-field@"],
-                                        "post_tags": ["@/kibana-highlighted-field@"],
-                                        "fields": { "*":{} },
-                                        "require_field_match": False,
-                                        "fragment_size": 2147483647
-                                        },
-                                    "query": {
-                                        "query_string": {
-                                            "query": result,
-                                            "analyze_wildcard": True
-                                            }
-                                        }
+                                    "query": result
                                     }
                             }
                         }
-                    })
+                    }
+                if self.output_type == "import":    # serialize right away as element of the exported list, finalize() only joins them
+                    search['_source']['kibanaSavedObjectMeta']['searchSourceJSON'] = self.generateSearchSourceJSON(search['_source']['kibanaSavedObjectMeta']['searchSourceJSON'])
+                    search = "  " + json.dumps(search, indent=2).replace("\n", "\n  ")
+                self.kibanaconf.append(search)
 
     def finalize(self):
         if self.output_type == "import":        # output format that can be imported via Kibana UI
-            for item in self.kibanaconf:    # JSONize kibanaSavedObjectMeta.searchSourceJSON
-                item['_source']['kibanaSavedObjectMeta']['searchSourceJSON'] = json.dumps(item['_source']['kibanaSavedObjectMeta']['searchSourceJSON'])
-            return json.dumps(self.kibanaconf, indent=2)
+            if not self.kibanaconf:
+                return "[]"
+            return "[\n" + ",\n".join(self.kibanaconf) + "\n]"
         elif self.output_type == "curl":
             for item in self.indexsearch:
                 return item
             for item in self.kibanaconf:
                 item['_source']['kibanaSavedObjectMeta']['searchSourceJSON']['index'] = "$" + self.index_variable_name(item['_source']['kibanaSavedObjectMeta']['searchSourceJSON']['index'])   # replace index pattern with reference to variable that will contain Kibana index UUID at script runtime
-                item['_source']['kibanaSavedObjectMeta']['searchSourceJSON'] = json.dumps(item['_source']['kibanaSavedObjectMeta']['searchSourceJSON'])     # Convert it to JSON string as expected by Kibana
+                item['_source']['kibanaSavedObjectMeta']['searchSourceJSON'] = self.generateSearchSourceJSON(item['_source']['kibanaSavedObjectMeta']['searchSourceJSON'])     # Convert it to JSON string as expected by Kibana
                 item['_source']['kibanaSavedObjectMeta']['searchSourceJSON'] = item['_source']['kibanaSavedObjectMeta']['searchSourceJSON'].replace("\\", "\\\\")      # Add further escaping for escaped quotes for shell
                 return "curl -s -XPUT -H 'Content-Type: application/json' --data-binary @- '{es}/{index}/_doc/{doc_id}' <<EOF\n{doc}\nEOF".format(
                         es=self.es,
@@ -360,6 +360,11 @@ class KibanaBackend(ElasticsearchQuerystringBackend, MultiRuleOutputMixin):
         else:
             raise NotImplementedError("Output type '%s' not supported" % self.output_type)
 
+    def generateSearchSourceJSON(self, searchsource):
+        """Serialize index and query of a saved search into the searchSourceJSON template"""
+        prefix, infix, suffix = self.searchSourceTemplate
+        return prefix + json.dumps(searchsource['index']) + infix + json.dumps(searchsource['query']) + suffix
+
     def index_variable_name(self, index):
         return "index_" + index.replace("-", "__").replace("*", "X")
 
@@ -380,12 +385,13 @@ class XPackWatcherBackend(ElasticsearchQuerystringBackend, MultiRuleOutputMixin)
     def generate(self, sigmaparser):
         # get the details if this alert occurs
         rulename = self.getRuleName(sigmaparser)
-        title = sigmaparser.parsedyaml.setdefault("title", "")
-        description = sigmaparser.parsedyaml.setdefault("description", "")
-        false_positives = sigmaparser.parsedyaml.setdefault("falsepositives", "")
-        level = sigmaparser.parsedyaml.setdefault("level", "")
+        parsedyaml = sigmaparser.parsedyaml
+        title = parsedyaml.get("title", "")
+        description = parsedyaml.get("description", "")
+        false_positives = parsedyaml.get("falsepositives", "")
+        level = parsedyaml.get("level", "")
         # Get time frame if exists
-        interval = sigmaparser.parsedyaml["detection"].setdefault("timeframe", "30m")
+        interval = parsedyaml["detection"].get("timeframe", "30m")
 
         # creating condition
         indices = sigmaparser.get_logsource().index
@@ -470,7 +476,7 @@ class XPackWatcherBackend(ElasticsearchQuerystringBackend, MultiRuleOutputMixin)
                 alert_value_location = "ctx.payload.hits.total"
                 action_body = "Hits:\n{{#ctx.payload.hits.hits}}"
                 try:    # extract fields if these are given in rule
-                    fields = sigmaparser.parsedyaml['fields']
+                    fields = parsedyaml['fields']
                     max_field_len = max([len(field) for field in fields])
                     action_body += "Hit on {{_source.@timestamp}}:\n" + "\n".join([
                         ("%" + str(max_field_len) + "s = {{_source.%s}}") % (field, field) for field in fields
@@ -509,7 +515,7 @@ class XPackWatcherBackend(ElasticsearchQuerystringBackend, MultiRuleOutputMixin)
                             }
                         }
 
-            self.watcher_alert[rulename] = {
+            watch = {
                               "trigger": {
                                 "schedule": {
                                   "interval": interval  # how often the watcher should check
@@ -539,19 +545,21 @@ class XPackWatcherBackend(ElasticsearchQuerystringBackend, MultiRuleOutputMixin)
                               },
                               "actions": { **action }
                             }
+            self.watcher_alert[rulename] = self.serializeWatch(rulename, watch)
+
+    def serializeWatch(self, rulename, rule):
+        """Serialize watch in the configured output format, returns None if the output type is not supported"""
+        if self.output_type == "plain":     # output request line + body
+            return "PUT _xpack/watcher/watch/%s\n%s\n" % (rulename, json.dumps(rule, indent=2))
+        elif self.output_type == "curl":      # output curl command line
+            return "curl -s -XPUT -H 'Content-Type: application/json' --data-binary @- %s/_xpack/watcher/watch/%s <<EOF\n%s\nEOF\n" % (self.es, rulename, json.dumps(rule, indent=2))
+        elif self.output_type == "json":    # output compressed watcher json, one per line
+            return json.dumps(rule) + "\n"
 
     def finalize(self):
-        result = ""
-        for rulename, rule in self.watcher_alert.items():
-            if self.output_type == "plain":     # output request line + body
-                result += "PUT _xpack/watcher/watch/%s\n%s\n" % (rulename, json.dumps(rule, indent=2))
-            elif self.output_type == "curl":      # output curl command line
-                result += "curl -s -XPUT -H 'Content-Type: application/json' --data-binary @- %s/_xpack/watcher/watch/%s <<EOF\n%s\nEOF\n" % (self.es, rulename, json.dumps(rule, indent=2))
-            elif self.output_type == "json":    # output compressed watcher json, one per line
-                result += json.dumps(rule) + "\n"
-            else:
-                raise NotImplementedError("Output type '%s' not supported" % self.output_type)
-        return result
+        if self.watcher_alert and self.output_type not in ("plain", "curl", "json"):
+            raise NotImplementedError("Output type '%s' not supported" % self.output_type)
+        return "".join(self.watcher_alert.values())
 
 class ElastalertBackend(MultiRuleOutputMixin, ElasticsearchQuerystringBackend):
     """Elastalert backend"""
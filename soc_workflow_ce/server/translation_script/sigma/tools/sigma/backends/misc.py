@@ -18,6 +18,8 @@ import re
 from .base import BaseBackend
 from .mixins import QuoteCharMixin
 
+reStar = re.compile("\\*")       # wildcard that is translated into '.*'
+
 class GrepBackend(BaseBackend, QuoteCharMixin):
     """Generates Perl compatible regular expressions and puts 'grep -P' around it"""
     identifier = "grep"
@@ -29,14 +31,15 @@ class GrepBackend(BaseBackend, QuoteCharMixin):
         return "grep -P '^%s'" % self.generateNode(parsed.parsedSearch)
 
     def cleanValue(self, val):
-        val = super().cleanValue(val)
-        return re.sub("\\*", ".*", val)
+        return reStar.sub(".*", super().cleanValue(val))
 
     def generateORNode(self, node):
-        return "(?:%s)" % "|".join([".*" + self.generateNode(val) for val in node])
+        generateNode = self.generateNode
+        return "(?:%s)" % "|".join([".*" + generateNode(val) for val in node])
 
     def generateANDNode(self, node):
-        return "".join(["(?=.*%s)" % self.generateNode(val) for val in node])
+        generateNode = self.generateNode
+        return "".join(["(?=.*%s)" % generateNode(val) for val in node])
 
     def generateNOTNode(self, node):
         return "(?!.*%s)" % self.generateNode(node.item)
@@ -45,7 +48,7 @@ class GrepBackend(BaseBackend, QuoteCharMixin):
         return "(?:.*%s)" % self.generateNode(node.items)
 
     def generateListNode(self, node):
-        if not set([type(value) for value in node]).issubset({str, int}):
+        if not all(type(value) in (str, int) for value in node):
             raise TypeError("List values must be strings or numbers")
         return self.generateORNode(node)
 
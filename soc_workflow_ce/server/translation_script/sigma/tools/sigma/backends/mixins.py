@@ -14,8 +14,22 @@
 # You should have received a copy of the GNU Lesser General Public License
 # along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
+import re
+from functools import lru_cache, partial
 import sigma
 
+reCharacterClass = re.compile("^\\[([^\\]\\\\^-]+)\\]$")     # regular expression that is only a plain character class, e.g. [<>]
+
+def cleanString(val, reEscape, escapeSubst, clearTable, reClear):
+    """Quote and filter characters of a value as configured by the attributes of QuoteCharMixin"""
+    if reEscape is not None:
+        val = reEscape.sub(escapeSubst, val)
+    if clearTable is not None:
+        val = val.translate(clearTable)
+    elif reClear is not None:
+        val = reClear.sub("", val)
+    return val
+
 ### Mixins
 class QuoteCharMixin:
     """
@@ -25,13 +39,21 @@ class QuoteCharMixin:
     reEscape = None                     # match characters that must be quoted
     escapeSubst = "\\\\\g<1>"           # Substitution that is applied to characters/strings matched for escaping by reEscape
     reClear = None                      # match characters that are cleaned out completely
+    clearTable = None                   # str.translate() deletion table, derived from reClear if it is a plain character class
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        cls.clearTable = None
+        if cls.reClear is not None:
+            match = reCharacterClass.match(cls.reClear.pattern)
+            if match and not cls.reClear.flags & re.IGNORECASE:
+                cls.clearTable = str.maketrans("", "", match.group(1))
+        # values repeat heavily across rules, therefore cleaned values are cached per backend class
+        cls.cleanValueCached = staticmethod(lru_cache(maxsize=8192)(partial(cleanString,
+            reEscape=cls.reEscape, escapeSubst=cls.escapeSubst, clearTable=cls.clearTable, reClear=cls.reClear)))
 
     def cleanValue(self, val):
-        if self.reEscape:
-            val = self.reEscape.sub(self.escapeSubst, val)
-        if self.reClear:
-            val = self.reClear.sub("", val)
-        return val
+        return self.cleanValueCached(val)
 
 class RulenameCommentMixin:
     """Prefixes each rule with the rule title."""
@@ -56,6 +78,7 @@ class MultiRuleOutputMixin:
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
         self.rulenames = set()
+        self.rulenameCounters = dict()     # rule name -> counter where the search for the next free name starts
 
     def getRuleName(self, sigmaparser):
         """
@@ -69,9 +92,10 @@ class MultiRuleOutputMixin:
         """
         rulename = sigmaparser.parsedyaml["title"].replace(" ", "-").replace("(", "").replace(")", "")
         if rulename in self.rulenames:   # add counter if name collides
-            cnt = 2
+            cnt = self.rulenameCounters.get(rulename, 2)
             while "%s-%d" % (rulename, cnt) in self.rulenames:
                 cnt += 1
+            self.rulenameCounters[rulename] = cnt + 1
             rulename = "%s-%d" % (rulename, cnt)
         self.rulenames.add(rulename)
 
@@ -42,7 +42,7 @@ class NetWitnessBackend(SingleTextQueryBackend):
 
     def generateMapItemNode(self, node):
         key, value = node
-        if self.mapListsSpecialHandling == False and type(value) in (str, int, list) or self.mapListsSpecialHandling == True and type(value) in (str, int):
+        if type(value) in (str, int) or type(value) is list and self.mapListsAsValues:
             if type(value) == str and "*" in value[1:-1]:
                 value = re.sub('([".^$]|\\\\(?![*?]))', '\\\\\g<1>', value)
                 value = re.sub('\\*', '.*', value)
@@ -52,9 +52,9 @@ class NetWitnessBackend(SingleTextQueryBackend):
                 value = re.sub("(\*\\\\)|(\*)", "", value)
                 return "(%s contains %s)" % (key, self.generateValueNode(value))
             elif type(value) in (str, int):
-                return self.mapExpression % (key, self.generateValueNode(value))
+                return self.formatMapItem(key, self.generateValueNode(value))
             else:
-                return self.mapExpression % (key, self.generateNode(value))
+                return self.formatMapItem(key, self.generateNode(value))
         elif type(value) == list:
             return self.generateMapItemListNode(key, value)
         else:
@@ -87,7 +87,7 @@ class NetWitnessBackend(SingleTextQueryBackend):
         return fmtquery
 
     def generateValueNode(self, node):
-        return self.valueExpression % (str(node))
+        return self.formatValue(str(node))
 
     def generate(self, sigmaparser):
         """Method is called for each sigma rule and receives the parsed rule (SigmaParser)"""
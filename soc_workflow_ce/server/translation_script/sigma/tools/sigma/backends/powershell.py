@@ -40,6 +40,7 @@ class PowerShellBackend(SingleTextQueryBackend):
     notNullExpression = "%s=\"*\""
     mapExpression = "$_.%s -eq %s"
     mapListsSpecialHandling = True
+    nodeGenerators = { **SingleTextQueryBackend.nodeGenerators, str: "generateKeywordNode", int: "generateKeywordNode" }     # values outside of map items are matched against the message
 
     logname = None
 
@@ -71,27 +72,8 @@ class PowerShellBackend(SingleTextQueryBackend):
             return " | ConvertTo-CSV -NoTypeInformation"
         return ""
 
-    def generateNode(self, node):
-        if type(node) == sigma.parser.condition.ConditionAND:
-            return self.generateANDNode(node)
-        elif type(node) == sigma.parser.condition.ConditionOR:
-            return self.generateORNode(node)
-        elif type(node) == sigma.parser.condition.ConditionNOT:
-            return self.generateNOTNode(node)
-        elif type(node) == sigma.parser.condition.ConditionNULLValue:
-            return self.generateNULLValueNode(node)
-        elif type(node) == sigma.parser.condition.ConditionNotNULLValue:
-            return self.generateNotNULLValueNode(node)
-        elif type(node) == sigma.parser.condition.NodeSubexpression:
-            return self.generateSubexpressionNode(node)
-        elif type(node) == tuple:
-            return self.generateMapItemNode(node)
-        elif type(node) in (str, int):
-            return self.generateValueNode(node, False)
-        elif type(node) == list:
-            return self.generateListNode(node)
-        else:
-            raise TypeError("Node type %s was not expected in Sigma parse tree" % (str(type(node))))
+    def generateKeywordNode(self, node):
+        return self.generateValueNode(node, False)
 
     def generateQuery(self, parsed, sigmaparser):
         result = self.generateNode(parsed.parsedSearch)
@@ -107,20 +89,20 @@ class PowerShellBackend(SingleTextQueryBackend):
 
     def generateMapItemNode(self, node):
         key, value = node
-        if self.mapListsSpecialHandling == False and type(value) in (str, int, list) or self.mapListsSpecialHandling == True and type(value) in (str, int):
+        if type(value) in (str, int) or type(value) is list and self.mapListsAsValues:
             if key in ("LogName","source"):
                 self.logname = value
             elif key in ("ID", "EventID"):
                 if key == "EventID":
                     key = "ID"
-                return self.mapExpression % (key, self.generateValueNode(value, True))
+                return self.formatMapItem(key, self.generateValueNode(value, True))
             elif type(value) == str and "*" in value:
                 value = value.replace("*", ".*")
                 return "$_.message -match %s" % (self.generateValueNode(key + ".*" + value, True))
             elif type(value) in (str, int):
                 return '$_.message -match %s' % (self.generateValueNode(key + ".*" +str(value), True))
             else:
-                return self.mapExpression % (key, self.generateNode(value))
+                return self.formatMapItem(key, self.generateNode(value))
         elif type(value) == list:
             return self.generateMapItemListNode(key, value)
         else:
@@ -132,7 +114,7 @@ class PowerShellBackend(SingleTextQueryBackend):
             if key in ("ID", "EventID"):
                 if key == "EventID":
                     key = "ID"
-                itemslist.append(self.mapExpression % (key, self.generateValueNode(item, True)))
+                itemslist.append(self.formatMapItem(key, self.generateValueNode(item, True)))
             elif type(item) == str and "*" in item:
                 item = item.replace("*", ".*")
                 itemslist.append('$_.message -match %s' % (self.generateValueNode(key + ".*" +item, True)))
@@ -140,19 +122,11 @@ class PowerShellBackend(SingleTextQueryBackend):
                 itemslist.append('$_.message -match %s' % (self.generateValueNode(item, True)))
         return '('+" -or ".join(itemslist)+')'
 
-    def generateANDNode(self, node):
-        generated = [ self.generateNode(val) for val in node ]
-        filtered = [ g for g in generated if g is not None ]
-        if filtered:
-            return self.andToken.join(filtered)
-        else:
-            return None
-
     def generateValueNode(self, node, keypresent):
         if keypresent == False:
             return "$_.message -match \"{0}\"".format(str(node))
         else:
-            return self.valueExpression % (self.cleanValue(str(node)))
+            return self.formatValue(self.cleanValue(str(node)))
 
     def getPowerShellCondOp(self, cond_op):
         if(cond_op == "<"):
@@ -40,6 +40,12 @@ class QRadarBackend(SingleTextQueryBackend):
     mapExpression = "%s=%s"
     mapListsSpecialHandling = True
     aql_database = "events"
+    nodeGenerators = { **SingleTextQueryBackend.nodeGenerators, str: "generateKeywordNode", int: "generateKeywordNode" }     # values outside of map items are searched in the payload
+    mapItemGenerators = {
+            str: "generateStringMapItemNode",
+            int: "generateIntMapItemNode",
+            list: "generateMapItemListNode",
+            }
 
     def cleanKey(self, key):
         if " " in key:
@@ -48,65 +54,43 @@ class QRadarBackend(SingleTextQueryBackend):
         else:
             return key
 
-    def generateNode(self, node):
-        if type(node) == sigma.parser.condition.ConditionAND:
-            return self.generateANDNode(node)
-        elif type(node) == sigma.parser.condition.ConditionOR:
-            return self.generateORNode(node)
-        elif type(node) == sigma.parser.condition.ConditionNOT:
-            return self.generateNOTNode(node)
-        elif type(node) == sigma.parser.condition.ConditionNULLValue:
-            return self.generateNULLValueNode(node)
-        elif type(node) == sigma.parser.condition.ConditionNotNULLValue:
-            return self.generateNotNULLValueNode(node)
-        elif type(node) == sigma.parser.condition.NodeSubexpression:
-            return self.generateSubexpressionNode(node)
-        elif type(node) == tuple:
-            return self.generateMapItemNode(node)
-        elif type(node) in (str, int):
-            return self.generateValueNode(node, False)
-        elif type(node) == list:
-            return self.generateListNode(node)
-        else:
-            raise TypeError("Node type %s was not expected in Sigma parse tree" % (str(type(node))))
+    def generateKeywordNode(self, node):
+        return self.generateValueNode(node, False)
 
+    def generateStringMapItemNode(self, key, value):
+        if "*" in value:
+            value = value.replace("*", "%")
+            return "%s ilike %s" % (self.cleanKey(key), self.generateValueNode(value, True))
+        return self.formatMapItem(self.cleanKey(key), self.generateValueNode(value, True))
 
-    def generateMapItemNode(self, node):
-        key, value = node
-        if self.mapListsSpecialHandling == False and type(value) in (str, int, list) or self.mapListsSpecialHandling == True and type(value) in (str, int):
-            if type(value) == str and "*" in value:
-                value = value.replace("*", "%")
-                return "%s ilike %s" % (self.cleanKey(key), self.generateValueNode(value, True))
-            elif type(value) in (str, int):
-                return self.mapExpression % (self.cleanKey(key), self.generateValueNode(value, True))
-            else:
-                return self.mapExpression % (self.cleanKey(key), self.generateNode(value))
-        elif type(value) == list:
-            return self.generateMapItemListNode(key, value)
-        else:
-            raise TypeError("Backend does not support map values of type " + str(type(value)))
+    def generateIntMapItemNode(self, key, value):
+        return self.formatMapItem(self.cleanKey(key), self.generateValueNode(value, True))
 
     def generateMapItemListNode(self, key, value):
+        generateValueNode = self.generateValueNode
+        key = self.cleanKey(key)
+        likePrefix = key + " ilike "
+        equalPrefix = key + " = "
         itemslist = list()
         for item in value:
             if type(item) == str and "*" in item:
-                item = item.replace("*", "%")
-                itemslist.append('%s ilike %s' % (self.cleanKey(key), self.generateValueNode(item, True)))
+                itemslist.append(likePrefix + generateValueNode(item.replace("*", "%"), True))
             else:
-                itemslist.append('%s = %s' % (self.cleanKey(key), self.generateValueNode(item, True)))
+                itemslist.append(equalPrefix + generateValueNode(item, True))
         return '('+" or ".join(itemslist)+')'
 
     def generateValueNode(self, node, keypresent):
-        if keypresent == False:
-            return "UTF8(payload) ilike \'{0}{1}{2}\'".format("%", self.cleanValue(str(node)), "%")
+        cleaned = self.cleanValue(str(node))
+        if keypresent == False:     # search value anywhere in the payload
+            return "UTF8(payload) ilike '%" + cleaned + "%'"
         else:
-            return self.valueExpression % (self.cleanValue(str(node)))
+            return self.formatValue(cleaned)
 
     def generateNULLValueNode(self, node):
-        return self.nullExpression % (node.item)
+        return self.formatNULLValue(node.item)
 
     def generateNotNULLValueNode(self, node):
-        return self.notNullExpression % (node.item)
+        return self.formatNotNULLValue(node.item)
 
     def generateAggregation(self, agg):
         if agg == None:
@@ -34,66 +34,64 @@ class QualysBackend(SingleTextQueryBackend):
     mapExpression = "%s:`%s`"
     mapListsSpecialHandling = True
     PartialMatchFlag = False
+    mapItemGenerators = {
+            str: "generateScalarMapItemNode",
+            int: "generateScalarMapItemNode",
+            list: "generateMapItemListNode",
+            }
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        fl = []
+        fl = set()
         for item in self.sigmaconfig.fieldmappings.values():
             if item.target_type == list:
-                fl.extend(item.target)
+                fl.update(item.target)
             else:
-                fl.append(item.target)
-        self.allowedFieldsList = list(set(fl))
+                fl.add(item.target)
+        self.allowedFieldsList = frozenset(fl)
 
     def generateORNode(self, node):
-        new_list = []
-        for val in node:
-            if type(val) == tuple and not(val[0] in self.allowedFieldsList):
-                pass
-                # self.PartialMatchFlag = True
-            else:
-                new_list.append(val)
-
-        generated = [self.generateNode(val) for val in new_list]
-        filtered = [g for g in generated if g is not None]
-        return self.orToken.join(filtered)
+        allowedFieldsList = self.allowedFieldsList
+        operands = [ val for val in node if type(val) != tuple or val[0] in allowedFieldsList ]
+        if not operands:    # all map items refer to unknown fields
+            return ""
+        if len(operands) == 1:
+            generated = self.generateNode(operands[0])
+            return generated if generated is not None else ""
+        return self.orToken.join([ g for g in map(self.generateNode, operands) if g is not None ])
 
     def generateANDNode(self, node):
-        new_list = []
+        allowedFieldsList = self.allowedFieldsList
+        generateNode = self.generateNode
+        filtered = list()
         for val in node:
-            if type(val) == tuple and not(val[0] in self.allowedFieldsList):
+            if type(val) == tuple and not(val[0] in allowedFieldsList):
                 self.PartialMatchFlag = True
             else:
-                new_list.append(val)
-        generated = [self.generateNode(val) for val in new_list]
-        filtered = [g for g in generated if g is not None]
+                generated = generateNode(val)
+                if generated is not None:
+                    filtered.append(generated)
+        if len(filtered) == 1:
+            return filtered[0]
         return self.andToken.join(filtered)
 
-    def generateMapItemNode(self, node):
-        key, value = node
-        if self.mapListsSpecialHandling == False and type(value) in (str, int, list) or self.mapListsSpecialHandling == True and type(value) in (str, int):
-            if key in self.allowedFieldsList:
-                return self.mapExpression % (key, self.generateNode(value))
-            else:
-                return self.generateNode(value)
-        elif type(value) == list:
-            return self.generateMapItemListNode(key, value)
+    def generateScalarMapItemNode(self, key, value):
+        if key in self.allowedFieldsList:
+            return self.formatMapItem(key, self.generateNode(value))
         else:
-            raise TypeError("Backend does not support map values of type " + str(type(value)))
+            return self.generateNode(value)
 
     def generateMapItemListNode(self, key, value):
-        itemslist = []
-        for item in value:
-            if key in self.allowedFieldsList:
-                itemslist.append('%s:`%s`' % (key, self.generateValueNode(item)))
-            else:
-                itemslist.append('%s' % (self.generateValueNode(item)))
+        generateValueNode = self.generateValueNode
+        if key in self.allowedFieldsList:
+            prefix = key + ":`"
+            itemslist = [ prefix + generateValueNode(item) + "`" for item in value ]
+        else:
+            itemslist = [ generateValueNode(item) for item in value ]
         return "(" + (" or ".join(itemslist)) + ")"
 
     def generate(self, sigmaparser):
         """Method is called for each sigma rule and receives the parsed rule (SigmaParser)"""
-        all_keys = set()
-
         for parsed in sigmaparser.condparsed:
             query = self.generateQuery(parsed)
             if query == "()":
@@ -41,9 +41,11 @@ class SplunkBackend(SingleTextQueryBackend):
     mapListValueExpression = "%s IN %s"
 
     def generateMapItemListNode(self, key, value):
-        if not set([type(val) for val in value]).issubset({str, int}):
+        if not all(type(val) in (str, int) for val in value):
             raise TypeError("List values must be strings or numbers")
-        return "(" + (" OR ".join(['%s=%s' % (key, self.generateValueNode(item)) for item in value])) + ")"
+        generateValueNode = self.generateValueNode
+        prefix = key + "="
+        return "(" + " OR ".join([ prefix + generateValueNode(item) for item in value ]) + ")"
 
     def generateAggregation(self, agg):
         if agg == None:
@@ -131,7 +133,9 @@ class SplunkXMLBackend(SingleTextQueryBackend, MultiRuleOutputMixin):
     mapListValueExpression = SplunkBackend.mapListValueExpression
 
     def generateMapItemListNode(self, key, value):
-        return "(" + (" OR ".join(['%s=%s' % (key, self.generateValueNode(item)) for item in value])) + ")"
+        generateValueNode = self.generateValueNode
+        prefix = key + "="
+        return "(" + " OR ".join([ prefix + generateValueNode(item) for item in value ]) + ")"
 
     def generateAggregation(self, agg):
         if agg == None:
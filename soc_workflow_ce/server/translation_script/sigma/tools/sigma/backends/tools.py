@@ -34,7 +34,7 @@ class FieldnameListBackend(BaseBackend):
         self.fields.update(fields)
 
     def generateANDNode(self, node):
-        return [self.generateNode(val) for val in node]
+        return list(map(self.generateNode, node))
 
     def generateORNode(self, node):
         return self.generateANDNode(node)
@@ -46,9 +46,9 @@ class FieldnameListBackend(BaseBackend):
         return self.generateNode(node.items)
 
     def generateListNode(self, node):
-        if not set([type(value) for value in node]).issubset({str, int}):
+        if not all(type(value) in (str, int) for value in node):
             raise TypeError("List values must be strings or numbers")
-        return [self.generateNode(value) for value in node]
+        return list(map(self.generateNode, node))
 
     def generateMapItemNode(self, node):
         key, value = node
@@ -78,8 +78,15 @@ class FieldnameListBackend(BaseBackend):
 
 # Helpers
 def flatten(l):
-  for i in l:
-      if type(i) == list:
-          yield from flatten(i)
-      else:
-          yield i
+    """Iterate over the non-list items of arbitrarily nested lists, without recursion"""
+    stack = [iter(l)]
+    while stack:
+        try:
+            i = next(stack[-1])
+        except StopIteration:
+            stack.pop()
+            continue
+        if type(i) == list:
+            stack.append(iter(i))
+        else:
+            yield i
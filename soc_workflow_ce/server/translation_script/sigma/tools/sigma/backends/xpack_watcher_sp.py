@@ -99,7 +99,7 @@ class XPackWatcherSPBackend(ElasticsearchQuerystringBackend, MultiRuleOutputMixi
               }            
             
 
-            self.watcher_alert[rulename] = {
+            watch = {
                               "trigger": {
                                 "schedule": {
                                   "interval": '{}m'.format(interval)  # how often the watcher should check
@@ -160,11 +160,9 @@ class XPackWatcherSPBackend(ElasticsearchQuerystringBackend, MultiRuleOutputMixi
                                     "message": message
                                     }
                             }
+            self.watcher_alert[rulename] = json.dumps(watch, indent=2) + "\n"  # indent!!!!!!!!!!!
 
     def finalize(self):
-        result = ""
-        for rulename, rule in self.watcher_alert.items():
-            result += json.dumps(rule, indent=2) + "\n"  # indent!!!!!!!!!!!
-        return result
+        return "".join(self.watcher_alert.values())
 
 